@@ -5,12 +5,37 @@ yt-dlp Python API를 사용하여 영상 정보와 자막을 추출합니다.
 """
 
 import argparse
+import html
+import io
+import json
 import os
 import re
 import sys
 import tempfile
+import time
 from pathlib import Path
 
+# 자막 파싱용 정규식 (줄 단위 루프에서 재컴파일하지 않도록 모듈 레벨에 캐시)
+_TAG_RE = re.compile(r"<[^>]+>")
+# WebVTT 큐: 타임스탬프로 시작하고 "-->"를 포함하는 줄 + 이어지는 비어 있지 않은 줄들
+_CUE_RE = re.compile(
+    r"^[^\S\n]*(?P<ts>\d{1,2}:\d{2}:\d{2}\.\d{3}|\d{2}:\d{2}\.\d{3})[^\n]*-->[^\n]*"
+    r"(?P<text>(?:\n[^\S\n]*\S[^\n]*)*)",
+    re.M,
+)
+_SRT_TS_RE = re.compile(r"(\d{2}:\d{2}:\d{2})")
+_BLOCK_RE = re.compile(r"\n\n+")
+
+# 영상 info 디스크 캐시 (반복 실행 시 yt-dlp 추출 생략)
+_VIDEO_ID_RE = re.compile(r"(?:v=|/shorts/|youtu\.be/)([\w-]{11})")
+_INFO_CACHE_TTL = 3600  # 초
+
+# 자막 언어 우선순위: ko, ko-KR, en, en-US
+_PREFERRED_LANGS = ("ko", "ko-KR", "en", "en-US", "en-orig")
+
+# deduplicate_entries가 비교하는 병합 텍스트 끝부분 길이 (스크롤링 겹침은 국소적)
+_DEDUP_WINDOW = 512
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -68,49 +93,91 @@ def extract_metadata(url):
     return info
 
 
-def extract_subtitles(url, tmpdir):
-    """자막을 추출합니다. 한국어 우선, 없으면 영어 폴백."""
+def _info_cache_path(url):
+    """URL의 영상 ID로 info 캐시 파일 경로를 만듭니다. ID를 찾지 못하면 None."""
+    match = _VIDEO_ID_RE.search(url)
+    if not match:
+        return None
+    cache_root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_root) / "yt-analyzer" / f"{match.group(1)}.json"
+
+
+def load_metadata(url):
+    """extract_metadata() 결과를 영상 ID별로 디스크에 캐시하여 재사용.
+
+    캐시가 _INFO_CACHE_TTL 이내면 yt-dlp 추출을 건너뛰고, 만료된 캐시는 삭제합니다.
+    캐시 읽기/쓰기 실패는 무시합니다.
+    """
+    cache = _info_cache_path(url)
+    if cache is not None:
+        try:
+            if time.time() - cache.stat().st_mtime < _INFO_CACHE_TTL:
+                return json.loads(cache.read_bytes())
+            cache.unlink()
+        except (OSError, ValueError):
+            pass
+
+    info = extract_metadata(url)
+
+    if cache is not None:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            _prune_info_cache(cache.parent)
+            cache.write_bytes(json.dumps(_cacheable_info(info)).encode())
+        except (OSError, TypeError, ValueError):
+            pass
+
+    return info
+
+
+def _cacheable_info(info):
+    """캐시에 저장할 info: JSON 직렬화 가능한 형태로 정리하고 쓰지 않는 자막 언어는 제외."""
+    import yt_dlp
+
+    info = yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True)
+    for key in ("subtitles", "automatic_captions"):
+        subs = info.get(key) or {}
+        info[key] = {lang: subs[lang] for lang in _PREFERRED_LANGS if lang in subs}
+    return info
+
+
+def _prune_info_cache(cache_dir):
+    """만료된 info 캐시 파일 삭제."""
+    now = time.time()
+    for entry in cache_dir.glob("*.json"):
+        try:
+            if now - entry.stat().st_mtime >= _INFO_CACHE_TTL:
+                entry.unlink()
+        except OSError:
+            pass
+
+
+def extract_subtitles(url, tmpdir, info):
+    """자막을 추출합니다. 한국어 우선, 없으면 영어 폴백.
+
+    info는 extract_metadata()가 이미 가져온 결과로, 자막 언어 확인을 위해
+    영상 정보를 다시 추출하지 않습니다.
+    (subtitle_file, lang, is_auto)를 반환하며 is_auto는 자동 생성 자막 여부입니다.
+    """
     try:
         import yt_dlp
     except ImportError:
-        return None, None
+        return None, None, False
 
     # 사용 가능한 자막 언어 확인
-    check_opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "skip_download": True,
-        "ignoreerrors": False,
-    }
-
-    with yt_dlp.YoutubeDL(check_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-
     available_subs = info.get("subtitles", {})
     available_auto = info.get("automatic_captions", {})
 
-    # 언어 우선순위: ko, ko-KR, en, en-US
-    preferred_langs = ["ko", "ko-KR", "en", "en-US", "en-orig"]
-
-    chosen_lang = None
+    # 수동 자막 우선, 없으면 자동 자막
+    chosen_lang = next((lang for lang in _PREFERRED_LANGS if lang in available_subs), None)
     is_auto = False
-
-    for lang in preferred_langs:
-        if lang in available_subs:
-            chosen_lang = lang
-            is_auto = False
-            break
-
     if chosen_lang is None:
-        for lang in preferred_langs:
-            if lang in available_auto:
-                chosen_lang = lang
-                is_auto = True
-                break
+        chosen_lang = next((lang for lang in _PREFERRED_LANGS if lang in available_auto), None)
+        is_auto = chosen_lang is not None
 
     if chosen_lang is None:
         # 아무 자막도 없으면 None 반환
-        return None, None
+        return None, None, False
 
     # 선택된 언어의 자막 다운로드
     sub_opts = {
@@ -125,8 +192,10 @@ def extract_subtitles(url, tmpdir):
         "ignoreerrors": False,
     }
 
+    # ydl.download([url])은 영상 정보를 처음부터 다시 추출하므로, 이미 가져온
+    # info를 --load-info-json과 같은 방식으로 재처리해 자막만 기록한다.
     with yt_dlp.YoutubeDL(sub_opts) as ydl:
-        ydl.download([url])
+        ydl.process_ie_result(ydl.sanitize_info(info, True), download=True)
 
     # 다운로드된 자막 파일 찾기
     subtitle_file = None
@@ -137,64 +206,77 @@ def extract_subtitles(url, tmpdir):
             break
 
     if subtitle_file is None:
-        return None, chosen_lang
-
-    return subtitle_file, chosen_lang
-
-
-def parse_vtt(content):
-    """WebVTT 자막 파싱하여 (timestamp, text) 목록 반환."""
-    lines = content.splitlines()
-    entries = []
-    i = 0
-
-    # WEBVTT 헤더 건너뛰기
-    while i < len(lines) and not lines[i].strip().startswith("00:") and "-->" not in lines[i]:
-        i += 1
-
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # 타임스탬프 라인 감지
-        if "-->" in line:
-            timestamp_match = re.match(r"(\d{1,2}:\d{2}:\d{2}\.\d{3}|\d{2}:\d{2}\.\d{3})", line)
-            if timestamp_match:
-                timestamp = timestamp_match.group(1)
-                # HH:MM:SS.mmm 형식으로 정규화
-                if timestamp.count(":") == 1:
-                    timestamp = "00:" + timestamp
-                # 밀리초 제거하여 간결하게
-                timestamp = timestamp[:8]
-
-                # 텍스트 수집
-                i += 1
-                text_lines = []
-                while i < len(lines) and lines[i].strip():
-                    text_line = lines[i].strip()
-                    # VTT 태그 제거 (<c>, </c>, <00:00:00.000> 등)
-                    text_line = re.sub(r"<[^>]+>", "", text_line)
-                    text_line = re.sub(r"&amp;", "&", text_line)
-                    text_line = re.sub(r"&lt;", "<", text_line)
-                    text_line = re.sub(r"&gt;", ">", text_line)
-                    text_line = re.sub(r"&nbsp;", " ", text_line)
-                    if text_line:
-                        text_lines.append(text_line)
-                    i += 1
-
-                if text_lines:
-                    text = " ".join(text_lines)
-                    entries.append((timestamp, text))
-                continue
+        return None, chosen_lang, is_auto
+
+    return subtitle_file, chosen_lang, is_auto
+
+
+def _format_cue(timestamp, text):
+    """자막 큐 한 개의 출력 줄."""
+    return f"[{timestamp}] {text}"
+
+
+def _emit_cue(out, timestamp, text):
+    """스트리밍 모드에서 큐 한 줄을 out에 기록."""
+    out.write("\n")
+    out.write(_format_cue(timestamp, text))
+
+
+def parse_vtt(content, out=None):
+    """WebVTT 자막 파싱하여 (timestamps, texts) 병렬 목록 반환.
+
+    _CUE_RE 하나로 큐 헤더 감지, 타임스탬프 추출, 텍스트 블록 수집을 한 번에
+    처리합니다 (finditer로 파일을 한 번만 훑음).
+    out(텍스트 스트림)이 주어지면 목록을 만들지 않고 큐마다 _emit_cue()로 바로
+    기록하며, 기록한 큐 개수를 반환합니다.
+    """
+    timestamps = []
+    texts = []
+    count = 0
+
+    for match in _CUE_RE.finditer(content):
+        timestamp = match.group("ts")
+        # HH:MM:SS.mmm 형식으로 정규화
+        if timestamp.count(":") == 1:
+            timestamp = "00:" + timestamp
+        # 밀리초 제거하여 간결하게
+        timestamp = timestamp[:8]
+
+        # 텍스트 블록은 "\n"으로 시작하므로 첫 조각은 빈 문자열
+        text_lines = []
+        for line in match.group("text").split("\n")[1:]:
+            # 태그/엔티티가 없는 줄은 C 레벨 부분 문자열 검사만으로 통과시킴
+            text_line = line.strip()
+            # VTT 태그 제거 (<c>, </c>, <00:00:00.000> 등)
+            if "<" in text_line:
+                text_line = _TAG_RE.sub("", text_line)
+            # HTML 엔티티 디코딩 (&amp;, &lt;, &gt;, &nbsp; 등) 한 번에 처리
+            if "&" in text_line:
+                text_line = html.unescape(text_line).replace("\xa0", " ")
+            if text_line:
+                text_lines.append(text_line)
+
+        if not text_lines:
+            continue
+        if out is None:
+            timestamps.append(timestamp)
+            texts.append(" ".join(text_lines))
+        else:
+            _emit_cue(out, timestamp, " ".join(text_lines))
+            count += 1
 
-        i += 1
+    return (timestamps, texts) if out is None else count
 
-    return entries
 
+def parse_srt(content, out=None):
+    """SRT 자막 파싱하여 (timestamps, texts) 병렬 목록 반환.
 
-def parse_srt(content):
-    """SRT 자막 파싱하여 (timestamp, text) 목록 반환."""
-    entries = []
-    blocks = re.split(r"\n\n+", content.strip())
+    out이 주어지면 parse_vtt와 같이 큐를 바로 기록하고 큐 개수를 반환합니다.
+    """
+    timestamps = []
+    texts = []
+    count = 0
+    blocks = _BLOCK_RE.split(content.strip())
 
     for block in blocks:
         lines = block.strip().splitlines()
@@ -204,7 +286,7 @@ def parse_srt(content):
         # 첫 줄: 번호 (건너뜀)
         # 둘째 줄: 타임스탬프
         timestamp_line = lines[1] if len(lines) > 1 else ""
-        ts_match = re.match(r"(\d{2}:\d{2}:\d{2})", timestamp_line)
+        ts_match = _SRT_TS_RE.match(timestamp_line)
         if not ts_match:
             continue
 
@@ -212,86 +294,144 @@ def parse_srt(content):
         text_lines = lines[2:]
         text = " ".join(t.strip() for t in text_lines if t.strip())
         # HTML 태그 제거
-        text = re.sub(r"<[^>]+>", "", text)
+        if "<" in text:
+            text = _TAG_RE.sub("", text)
 
         if text:
-            entries.append((timestamp, text))
+            if out is None:
+                timestamps.append(timestamp)
+                texts.append(text)
+            else:
+                _emit_cue(out, timestamp, text)
+                count += 1
 
-    return entries
+    return (timestamps, texts) if out is None else count
 
 
-def parse_subtitle_file(filepath):
-    """자막 파일을 파싱하여 (timestamp, text) 목록 반환."""
+def parse_subtitle_file(filepath, out=None):
+    """자막 파일을 파싱하여 (timestamps, texts) 병렬 목록 반환.
+
+    out은 parse_vtt/parse_srt에 그대로 전달되며, 이때는 기록한 큐 개수를 반환합니다.
+    """
     with open(filepath, "r", encoding="utf-8", errors="replace") as f:
         content = f.read()
 
     ext = Path(filepath).suffix.lower()
 
     if ext == ".vtt":
-        entries = parse_vtt(content)
-    elif ext == ".srt":
-        entries = parse_srt(content)
-    else:
-        # 알 수 없는 형식은 VTT로 시도 후 SRT 시도
-        entries = parse_vtt(content)
-        if not entries:
-            entries = parse_srt(content)
-
-    return entries
+        return parse_vtt(content, out)
+    if ext == ".srt":
+        return parse_srt(content, out)
+
+    # 알 수 없는 형식은 앞부분으로 형식을 추정해 한 번만 파싱
+    head = content[:256].lstrip("\ufeff").lstrip()
+    if head.startswith("WEBVTT"):
+        return parse_vtt(content, out)
+    # SRT: 첫 줄 전체가 큐 번호이고 다음 줄이 타임스탬프 (VTT 타임스탬프 줄과 구분)
+    first_line, _, rest = head.partition("\n")
+    if first_line.strip().isdigit() and "-->" in rest.partition("\n")[0]:
+        return parse_srt(content, out)
+
+    # 추정 실패 시 VTT로 시도 후 SRT 시도
+    result = parse_vtt(content, out)
+    cues = result if out is not None else len(result[1])
+    if not cues:
+        result = parse_srt(content, out)
+    return result
 
 
 def find_overlap(prev, curr):
-    """이전 텍스트의 끝부분과 현재 텍스트의 시작부분이 겹치는 길이를 반환."""
-    max_overlap = min(len(prev), len(curr))
-    for i in range(max_overlap, 0, -1):
-        if prev.endswith(curr[:i]):
-            return i
-    return 0
-
-
-def deduplicate_entries(entries):
-    """자동자막의 스크롤링 중복을 제거하고 깨끗한 텍스트로 병합."""
-    if not entries:
-        return entries
+    """이전 텍스트의 끝부분과 현재 텍스트의 시작부분이 겹치는 길이를 반환.
+
+    KMP 실패 함수로 curr의 접두사 중 prev의 접미사와 일치하는 가장 긴 길이를
+    O(len(prev) + len(curr))에 구한다.
+    """
+    m = min(len(prev), len(curr))
+    if m == 0:
+        return 0
+    pattern = curr[:m]
+
+    # pattern의 실패 함수 계산
+    fail = [0] * m
+    k = 0
+    for i in range(1, m):
+        while k and pattern[i] != pattern[k]:
+            k = fail[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        fail[i] = k
+
+    # prev의 끝 m글자를 스캔하며 일치 상태 추적 → 최종 상태가 겹침 길이
+    k = 0
+    for ch in prev[-m:]:
+        while k and (k == m or ch != pattern[k]):
+            k = fail[k - 1]
+        if ch == pattern[k]:
+            k += 1
+    return k
+
+
+def deduplicate_entries(timestamps, texts):
+    """자동자막의 스크롤링 중복을 제거하고 깨끗한 텍스트로 병합.
+
+    (timestamps, texts) 병렬 목록을 받아 같은 형태로 반환한다.
+
+    스크롤링 겹침은 항상 국소적이므로 병합 중인 텍스트 전체가 아니라
+    마지막 _DEDUP_WINDOW 글자(tail)만 비교해 항목당 비용을 일정하게 유지한다.
+    """
+    if not texts:
+        return timestamps, texts
 
     # 1단계: 겹침을 제거하며 전체 텍스트를 병합
-    merged_parts = [entries[0][1]]
-    timestamps = [entries[0][0]]
-
-    for ts, text in entries[1:]:
-        prev_text = merged_parts[-1]
-        # 완전 동일 → 무시
-        if text == prev_text:
-            continue
-        # 이전이 현재에 완전 포함 → 교체
-        if prev_text in text:
-            merged_parts[-1] = text
+    # 병합 중인 항목은 조각 목록으로 모아 두었다가 마지막에 한 번만 join
+    first_text = texts[0]
+    merged_timestamps = [timestamps[0]]
+    merged_parts = [[first_text]]
+    merged_len = len(first_text)
+    tail = first_text[-_DEDUP_WINDOW:]
+
+    for i in range(1, len(texts)):
+        text = texts[i]
+        # 현재가 이전에 완전 포함 (완전 동일 포함) → 무시
+        if text in tail:
             continue
-        # 현재가 이전에 완전 포함 → 무시
-        if text in prev_text:
-            continue
-        # 접미/접두 겹침 감지
-        overlap = find_overlap(prev_text, text)
-        if overlap > 5:
-            # 겹침 부분을 제거하고 새 부분만 추가
-            new_part = text[overlap:].strip()
+
+        new_part = None
+        if tail in text:
+            if merged_len <= _DEDUP_WINDOW:
+                # 이전이 현재에 완전 포함 → 교체
+                merged_parts[-1] = [text]
+                merged_len = len(text)
+                tail = text[-_DEDUP_WINDOW:]
+                continue
+            # 이전의 끝부분이 현재에 포함 → 그 뒤 새 부분만 추가
+            new_part = text[text.find(tail) + len(tail):].strip()
+        else:
+            # 접미/접두 겹침 감지
+            overlap = find_overlap(tail, text)
+            if overlap > 5:
+                # 겹침 부분을 제거하고 새 부분만 추가
+                new_part = text[overlap:].strip()
+
+        if new_part is not None:
             if new_part:
-                merged_parts[-1] = prev_text + " " + new_part
+                merged_parts[-1].append(new_part)
+                merged_len += 1 + len(new_part)
+                tail = (tail + " " + new_part)[-_DEDUP_WINDOW:]
             continue
+
         # 겹침 없음 → 새 항목
-        merged_parts.append(text)
-        timestamps.append(ts)
+        merged_parts.append([text])
+        merged_timestamps.append(timestamps[i])
+        merged_len = len(text)
+        tail = text[-_DEDUP_WINDOW:]
 
-    # 2단계: 적절한 길이로 분할하여 타임스탬프와 매핑
-    result = list(zip(timestamps, merged_parts))
-    return result
+    # 2단계: 조각을 합쳐 타임스탬프와 같은 길이의 텍스트 목록으로 반환
+    return merged_timestamps, [" ".join(parts) for parts in merged_parts]
 
 
-def format_subtitle_output(entries, lang):
-    """자막 엔트리를 읽기 쉬운 텍스트로 포맷."""
-    if not entries:
-        return "자막을 파싱할 수 없습니다."
-
+def format_subtitle_header(lang):
+    """자막 출력의 언어 표시 줄."""
     lang_label = ""
     if lang:
         if lang.startswith("ko"):
@@ -299,12 +439,29 @@ def format_subtitle_output(entries, lang):
         elif lang.startswith("en"):
             lang_label = " (영어)"
 
-    lines = [f"*언어: {lang}{lang_label}*", ""]
+    return f"*언어: {lang}{lang_label}*\n"
+
+
+def format_subtitle_output(timestamps, texts, lang):
+    """자막 (timestamps, texts) 목록을 읽기 쉬운 텍스트로 포맷."""
+    if not texts:
+        return "자막을 파싱할 수 없습니다."
 
-    for ts, text in entries:
-        lines.append(f"[{ts}] {text}")
+    header = format_subtitle_header(lang)
+    return header + "\n" + "\n".join(_format_cue(ts, text) for ts, text in zip(timestamps, texts))
 
-    return "\n".join(lines)
+
+def stream_subtitle_output(filepath, lang):
+    """중복 제거가 필요 없는 자막을 하나의 버퍼에 바로 포맷.
+
+    format_subtitle_output(*parse_subtitle_file(filepath), lang)과 같은 결과를
+    중간 목록 없이 만듭니다.
+    """
+    buf = io.StringIO()
+    buf.write(format_subtitle_header(lang))
+    if not parse_subtitle_file(filepath, buf):
+        return "자막을 파싱할 수 없습니다."
+    return buf.getvalue()
 
 
 def main():
@@ -313,7 +470,7 @@ def main():
 
     # 메타데이터 추출
     try:
-        info = extract_metadata(url)
+        info = load_metadata(url)
     except Exception as e:
         error_msg = str(e)
         if "Private video" in error_msg:
@@ -339,18 +496,22 @@ def main():
 
     # 설명 길이 제한 (너무 길면 잘라냄)
     max_desc_len = 3000
-    if len(description) > max_desc_len:
-        description = description[:max_desc_len] + f"\n\n... (이하 생략, 총 {len(description)}자)"
+    orig_len = len(description)
+    if orig_len > max_desc_len:
+        description = description[:max_desc_len] + f"\n\n... (이하 생략, 총 {orig_len}자)"
 
     # 자막 추출
     subtitle_text = None
     with tempfile.TemporaryDirectory() as tmpdir:
         try:
-            subtitle_file, lang = extract_subtitles(url, tmpdir)
-            if subtitle_file:
-                entries = parse_subtitle_file(subtitle_file)
-                entries = deduplicate_entries(entries)
-                subtitle_text = format_subtitle_output(entries, lang)
+            subtitle_file, lang, is_auto = extract_subtitles(url, tmpdir, info)
+            if subtitle_file and is_auto:
+                # 스크롤링 중복은 자동자막에만 있으므로 이 경우에만 중복 제거
+                timestamps, texts = parse_subtitle_file(subtitle_file)
+                timestamps, texts = deduplicate_entries(timestamps, texts)
+                subtitle_text = format_subtitle_output(timestamps, texts, lang)
+            elif subtitle_file:
+                subtitle_text = stream_subtitle_output(subtitle_file, lang)
             elif lang:
                 subtitle_text = f"*언어 {lang}의 자막을 찾았으나 다운로드에 실패했습니다.*"
         except Exception as e:
@@ -33,6 +33,8 @@ run_migrations() {
   # Run numbered migration scripts
   for migration in "${WTM_MIGRATIONS}"/*.py; do
     [[ -f "${migration}" ]] || continue
+    # Skip shared helpers (e.g. _atomic.py); only numbered scripts are migrations
+    [[ "$(basename "${migration}")" == [0-9]* ]] || continue
     local mig_num
     mig_num=$(basename "${migration}" | grep -o '^[0-9]*' | sed 's/^0*//')
     [[ -z "${mig_num}" ]] && continue
@@ -1,31 +1,47 @@
 #!/usr/bin/env python3
 """Migrate sessions.json v1 -> v2: add health, metrics, ttl, tags fields."""
 import json, sys
+from pathlib import Path
 
-file = sys.argv[1]
-with open(file) as f:
-    data = json.load(f)
+from _atomic import write_atomic
 
-if data.get("version", 0) >= 2:
-    sys.exit(0)  # Already at v2+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode()
 
-for sid, session in data.get("sessions", {}).items():
-    session.setdefault("last_activity_at", session.get("created_at"))
-    session.setdefault("ttl_hours", 168)
-    session.setdefault("tags", [])
-    session.setdefault("template", None)
-    session.setdefault("parent_session", None)
-    session.setdefault("metrics", {
+# (field, factory) pairs; factories build mutable defaults only when missing
+_DEFAULTS = (
+    ("last_activity_at", lambda s: s.get("created_at")),
+    ("ttl_hours", lambda s: 168),
+    ("tags", lambda s: []),
+    ("template", lambda s: None),
+    ("parent_session", lambda s: None),
+    ("metrics", lambda s: {
         "commits": 0, "files_changed": 0,
         "lines_added": 0, "lines_removed": 0,
         "duration_minutes": 0
-    })
-    session.setdefault("health", {
+    }),
+    ("health", lambda s: {
         "worktree_ok": True, "tmux_ok": True,
         "watcher_ok": True, "symlinks_ok": True,
         "last_check": None
-    })
+    }),
+)
+
+file = sys.argv[1]
+data = _loads(Path(file).read_bytes())
+
+if data.get("version", 0) >= 2:
+    sys.exit(0)  # Already at v2+
+
+for sid, session in data.get("sessions", {}).items():
+    for key, default in _DEFAULTS:
+        if key not in session:
+            session[key] = default(session)
 
 data["version"] = 2
-with open(file, "w") as f:
-    json.dump(data, f, indent=2)
+write_atomic(file, _dumps(data))
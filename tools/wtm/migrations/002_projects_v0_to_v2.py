@@ -1,25 +1,43 @@
 #!/usr/bin/env python3
 """Migrate projects.json from versionless (v0) to v2."""
 import json, sys
+from pathlib import Path
+
+from _atomic import write_atomic
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode()
 
 file = sys.argv[1]
-with open(file) as f:
-    data = json.load(f)
+data = _loads(Path(file).read_bytes())
 
 # v0 has no version field; treat missing as 0. Skip if already >= 2
 if data.get("version", 0) >= 2:
     sys.exit(0)
 
-for alias, project in data.get("aliases", {}).items():
-    project.setdefault("branch_naming", "{type}/{name}")
-    project.setdefault("conventional_commits", True)
-    project.setdefault("pr_template", True)
-    default_cleanup = data.get("defaults", {}).get("cleanup_after_days", 14)
-    project.setdefault("auto_cleanup_days", default_cleanup)
-    project.setdefault("symlink_patterns", [
+default_cleanup = data.get("defaults", {}).get("cleanup_after_days", 14)
+
+# (field, factory) pairs; factories build mutable defaults only when missing
+_DEFAULTS = (
+    ("branch_naming", lambda p: "{type}/{name}"),
+    ("conventional_commits", lambda p: True),
+    ("pr_template", lambda p: True),
+    ("auto_cleanup_days", lambda p: default_cleanup),
+    ("symlink_patterns", lambda p: [
         "node_modules:dir", "frontend/node_modules:dir", ".env:file"
-    ])
-    project.setdefault("hooks", {"post_create": [], "pre_kill": [], "post_kill": []})
+    ]),
+    ("hooks", lambda p: {"post_create": [], "pre_kill": [], "post_kill": []}),
+)
+
+for alias, project in data.get("aliases", {}).items():
+    for key, default in _DEFAULTS:
+        if key not in project:
+            project[key] = default(project)
 
 defaults = data.setdefault("defaults", {})
 defaults.setdefault("worktree_root", "~/.wtm/worktrees")
@@ -31,5 +49,4 @@ defaults.setdefault("disk_warning_gb", 5)
 data.setdefault("templates", {})
 data["version"] = 2
 
-with open(file, "w") as f:
-    json.dump(data, f, indent=2)
+write_atomic(file, _dumps(data))
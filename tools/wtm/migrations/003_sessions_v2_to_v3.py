@@ -1,37 +1,57 @@
 #!/usr/bin/env python3
 """Migrate sessions.json v2 -> v3: add cross-dimension fields."""
-import json, sys, socket
+import functools, json, sys, socket
+from pathlib import Path
 
-file = sys.argv[1]
-with open(file) as f:
-    data = json.load(f)
+from _atomic import write_atomic
 
-if data.get("version", 0) >= 3:
-    sys.exit(0)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode()
 
-machine_id = socket.gethostname().lower().replace(" ", "-")
 
-for sid, session in data.get("sessions", {}).items():
-    session.setdefault("child_sessions", [])
-    session.setdefault("session_group", None)
-    session.setdefault("session_chain", {"previous": None, "next": None})
-    session.setdefault("context", {
+@functools.lru_cache(maxsize=1)
+def _machine_id():
+    return socket.gethostname().lower().replace(" ", "-")
+
+
+# (field, factory) pairs; factories build mutable defaults only when missing
+_DEFAULTS = (
+    ("child_sessions", lambda s: []),
+    ("session_group", lambda s: None),
+    ("session_chain", lambda s: {"previous": None, "next": None}),
+    ("context", lambda s: {
         "journal_path": None,
         "last_handoff": None,
         "conversation_refs": []
-    })
-    session.setdefault("cross_project", {
+    }),
+    ("cross_project", lambda s: {
         "depends_on": [],
         "depended_by": [],
         "shared_group": None
-    })
-    session.setdefault("machine", {
-        "origin_machine": machine_id,
+    }),
+    ("machine", lambda s: {
+        "origin_machine": _machine_id(),
         "last_sync": None,
         "sync_branch": None
-    })
+    }),
+)
+
+file = sys.argv[1]
+data = _loads(Path(file).read_bytes())
+
+if data.get("version", 0) >= 3:
+    sys.exit(0)
+
+for sid, session in data.get("sessions", {}).items():
+    for key, default in _DEFAULTS:
+        if key not in session:
+            session[key] = default(session)
 
 data["version"] = 3
 
-with open(file, "w") as f:
-    json.dump(data, f, indent=2)
+write_atomic(file, _dumps(data))
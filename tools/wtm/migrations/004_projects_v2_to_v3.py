@@ -1,18 +1,35 @@
 #!/usr/bin/env python3
 """Migrate projects.json v2 -> v3: add cross-dimension fields."""
 import json, sys
+from pathlib import Path
+
+from _atomic import write_atomic
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode()
 
 file = sys.argv[1]
-with open(file) as f:
-    data = json.load(f)
+data = _loads(Path(file).read_bytes())
 
 if data.get("version", 0) >= 3:
     sys.exit(0)
 
+# (field, factory) pairs; factories build mutable defaults only when missing
+_DEFAULTS = (
+    ("dependencies", lambda p: []),
+    ("monorepo_packages", lambda p: []),
+    ("discovery_paths", lambda p: []),
+)
+
 for alias, project in data.get("aliases", {}).items():
-    project.setdefault("dependencies", [])
-    project.setdefault("monorepo_packages", [])
-    project.setdefault("discovery_paths", [])
+    for key, default in _DEFAULTS:
+        if key not in project:
+            project[key] = default(project)
 
 defaults = data.setdefault("defaults", {})
 defaults.setdefault("auto_discover", False)
@@ -23,5 +40,4 @@ defaults.setdefault("sync_branch_prefix", "wtm-state")
 data.setdefault("machines", {})
 data["version"] = 3
 
-with open(file, "w") as f:
-    json.dump(data, f, indent=2)
+write_atomic(file, _dumps(data))
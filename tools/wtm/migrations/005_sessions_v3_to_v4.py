@@ -12,6 +12,17 @@ Changes:
 
 import json
 import sys
+from pathlib import Path
+
+from _atomic import write_atomic
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda d: orjson.dumps(d, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    _dumps = lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode()
 
 
 def migrate_session(session: dict) -> dict:
@@ -55,8 +66,7 @@ def main():
 
     path = sys.argv[1]
 
-    with open(path, "r") as f:
-        data = json.load(f)
+    data = _loads(Path(path).read_bytes())
 
     current_version = data.get("version", 0)
     if current_version >= 4:
@@ -74,8 +84,7 @@ def main():
     data["version"] = 4
     data["sessions"] = sessions
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    write_atomic(path, _dumps(data))
 
     print(f"Migrated {len(sessions)} session(s) from v3 to v4")
 
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Shared helper for wtm migrations (no numeric prefix, so run_migrations skips it)."""
+import os, shutil
+from pathlib import Path
+
+
+def write_atomic(file, payload):
+    """Write payload to file via <file>.tmp + rename, keeping the original file mode.
+
+    A crash never leaves a half-written file, and the tmp file is removed on failure.
+    """
+    tmp = file + ".tmp"
+    try:
+        Path(tmp).write_bytes(payload)
+        if os.path.exists(file):
+            shutil.copymode(file, tmp)
+        os.replace(tmp, file)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise